@@ -1,17 +1,51 @@
-# Copyright 2014-2025 the openage authors. See copying.md for legal info.
+# Copyright 2014-2026 the openage authors. See copying.md for legal info.
 
 """
 Entry point for the code compliance checker.
 """
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
 import importlib
+import multiprocessing
 import os
 import shutil
 import subprocess
 import sys
 
-from .util import log_setup
+from .cache import find_issues_cached
+from .util import listfiles, log_setup
+
+
+# checks that are enabled by --fast, --merge and --all
+FAST_CHECKS = ('authors', 'cppstyle', 'cython', 'headerguards',
+               'legal', 'filemodes', 'textfiles')
+MERGE_CHECKS = FAST_CHECKS + ('pystyle', 'pylint', 'test_git_change_years')
+ALL_CHECKS = MERGE_CHECKS + ('clang_tidy',)
+
+# check argument -> checker module
+CHECKER_MODULES = {
+    'headerguards': '.headerguards',
+    'authors': '.authors',
+    'pystyle': '.pystyle',
+    'cython': '.cython',
+    'cppstyle': '.cppstyle',
+    'pylint': '.pylint',
+    'textfiles': '.textfiles',
+    'legal': '.legal',
+    'filemodes': '.modes',
+    'clang_tidy': '.clangtidy',
+}
+
+# checks whose issues can be cached file by file with --cache-dir
+CACHEABLE_CHECKS = {'cppstyle', 'cython'}
+
+# directories checked by the textfiles checker
+TEXTFILE_DIRS = ('openage', 'libopenage', 'buildsystem', 'doc', 'legal', 'etc/gdb_pretty')
+
+# git diff status letters of files that are checked with --only-changed-files
+CHANGED_FILE_STATUSES = "ACMRTUXB"
 
 
 def parse_args():
@@ -29,6 +63,10 @@ def parse_args():
     cli.add_argument("--only-changed-files", metavar='GITREF',
                      help=("slow checks are only done on files that have "
                            "changed since GITREF."))
+    cli.add_argument("--cache-dir", metavar='DIR',
+                     help=("cache the issues of the per-file checks in DIR "
+                           "(e.g. .codecompliance-cache), "
+                           "unchanged files are not checked again."))
     cli.add_argument("--authors", action="store_true",
                      help=("check whether all git authors are in copying.md. "
                            "repo must be a git repository."))
@@ -49,6 +87,9 @@ def parse_args():
                            "correct access bits (-> 0644) "))
     cli.add_argument("--pylint", action="store_true",
                      help="run pylint on the python code")
+    cli.add_argument("--pylint-jobs", type=int, default=0, metavar='N',
+                     help=("number of parallel pylint processes, "
+                           "0 uses all available cpus"))
     cli.add_argument("--pystyle", action="store_true",
                      help=("check whether the python code complies with "
                            "(a selected subset of) pep8."))
@@ -84,29 +125,21 @@ def process_args(args, error):
     # set up log level
     log_setup(args.verbose - args.quiet)
 
-    if args.fast or args.merge or args.all:
-        # enable "fast" tests
-        args.authors = True
-        args.cppstyle = True
-        args.cython = True
-        args.headerguards = True
-        args.legal = True
-        args.filemodes = True
-        args.textfiles = True
-
-    if args.merge or args.all:
-        # enable tests that are required before merging to master
-        args.pystyle = True
-        args.pylint = True
-        args.test_git_change_years = True
-
     if args.all:
         # enable tests that take a bit longer
-        args.clang_tidy = True
+        enabled_checks = ALL_CHECKS
+    elif args.merge:
+        # enable tests that are required before merging to master
+        enabled_checks = MERGE_CHECKS
+    elif args.fast:
+        enabled_checks = FAST_CHECKS
+    else:
+        enabled_checks = ()
+
+    for check in enabled_checks:
+        setattr(args, check, True)
 
-    if not any((args.headerguards, args.legal, args.authors, args.pystyle,
-                args.cppstyle, args.cython, args.test_git_change_years,
-                args.pylint, args.filemodes, args.textfiles, args.clang_tidy)):
+    if not any(getattr(args, check) for check in ALL_CHECKS):
         error("no checks were specified")
 
     has_git = bool(shutil.which('git'))
@@ -139,6 +172,9 @@ def process_args(args, error):
         if not importlib.util.find_spec('pylint'):
             error("pylint python module required for linting")
 
+        if args.pylint_jobs < 0:
+            error("--pylint-jobs must not be negative")
+
     if args.clang_tidy:
         if not shutil.which('clang-tidy'):
             error("--clang-tidy requires clang-tidy to be installed")
@@ -146,10 +182,39 @@ def process_args(args, error):
 
 def get_changed_files(gitref):
     """
-    return a list of changed files
+    return the frozenset of changed files
+
+    uses pygit2 if available, git otherwise.
     """
-    invocation = ['git', 'diff', '--name-only', '--diff-filter=ACMRTUXB',
-                  gitref]
+    try:
+        import pygit2
+    except ImportError:
+        return get_changed_files_git(gitref)
+
+    try:
+        repo = pygit2.Repository('.')
+        tree = repo.revparse_single(gitref).peel(pygit2.Tree)
+
+        # same as git diff: gitref -> index -> working directory
+        diff = repo.index.diff_to_tree(tree)
+        diff.merge(repo.diff())
+
+    except (pygit2.GitError, KeyError, ValueError) as exc:
+        raise RuntimeError(
+            "could not determine list of recently-changed files with pygit2"
+        ) from exc
+
+    return frozenset(delta.new_file.path for delta in diff.deltas
+                     if delta.status_char() in CHANGED_FILE_STATUSES)
+
+
+def get_changed_files_git(gitref):
+    """
+    return the frozenset of changed files, determined by invoking git
+    """
+    # -z: null-separated and unquoted, so any file name survives
+    invocation = ['git', 'diff', '--name-only', '-z',
+                  f'--diff-filter={CHANGED_FILE_STATUSES}', gitref]
 
     try:
         file_list = subprocess.check_output(invocation)
@@ -159,7 +224,8 @@ def get_changed_files(gitref):
             "could not determine list of recently-changed files with git"
         ) from exc
 
-    return set(file_list.decode('ascii').strip().split('\n'))
+    return frozenset(os.fsdecode(filename) for filename in file_list.split(b'\0')
+                     if filename)
 
 
 def main(args):
@@ -221,67 +287,111 @@ def main(args):
     return issues_count == 0
 
 
+def run_checker(modname, cache_dir, *checker_args):
+    """
+    Imports the checker module modname (relative to this package) and
+    returns the issues of its find_issues function as a list.
+
+    If cache_dir is not None, the checker is cacheable and its issues
+    are looked up in the cache in cache_dir first.
+
+    Runs in the worker processes of find_all_issues.
+    """
+    checker = importlib.import_module(modname, __package__)
+
+    if cache_dir is not None:
+        issues = find_issues_cached(checker, cache_dir, *checker_args)
+    else:
+        issues = checker.find_issues(*checker_args)
+
+    return list(issues)
+
+
 def find_all_issues(args, check_files=None):
     """
     Invokes all the individual issue checkers, and yields their returned
     issues.
 
+    The checkers are independent of each other, so each of them is run
+    in its own worker process. Issues are yielded as soon as a checker
+    has finished.
+
     If check_files is not None, all other files are ignored during the
     more resource-intense checks.
     That is, check_files is the set of files to verify.
 
     Yields tuples of (title, text) that are displayed as warnings.
     """
+    python_dirs = ('openage', 'buildsystem', 'etc/gdb_pretty')
+    legal_dirs = ('openage', 'buildsystem', 'libopenage', 'etc/gdb_pretty')
+
+    # with check_files, cython, cppstyle and clang_tidy check only those
+    # and don't walk their directories
+    all_files = check_files is None
+
+    # check argument -> (directories walked by its checker,
+    #                    arguments for the find_issues function of its checker)
+    checker_args = {
+        'headerguards': (('libopenage',), ('libopenage',)),
+        'authors': ((), ()),
+        # pycodestyle walks the directories by itself
+        'pystyle': ((), (check_files, python_dirs)),
+        'cython': (('openage',) if all_files else (),
+                   (check_files, ('openage',))),
+        'cppstyle': (('libopenage',) if all_files else (),
+                     (check_files, ('libopenage',))),
+        'pylint': (python_dirs, (check_files, python_dirs, args.pylint_jobs)),
+        'textfiles': (TEXTFILE_DIRS,
+                      (TEXTFILE_DIRS,
+                       ('.pxd', '.pyx', '.pxi', '.py',
+                        '.h', '.cpp', '.template',
+                        '', '.txt', '.md', '.conf',
+                        '.cmake', '.in', '.yml', '.supp', '.desktop'))),
+        'legal': (legal_dirs, (check_files, legal_dirs, args.test_git_change_years)),
+        'filemodes': (legal_dirs, (check_files, legal_dirs)),
+        'clang_tidy': (('libopenage',) if all_files else (),
+                       (check_files, ('libopenage', ))),
+    }
+
+    enabled_checks = [check for check in CHECKER_MODULES if getattr(args, check)]
+    if not enabled_checks:
+        return
+
+    # (checker module, its cache directory or None,
+    #  arguments for its find_issues function)
+    checkers = [(CHECKER_MODULES[check],
+                 os.path.join(args.cache_dir, check)
+                 if args.cache_dir and check in CACHEABLE_CHECKS else None,
+                 checker_args[check][1])
+                for check in enabled_checks]
+
+    # walk the source trees of the enabled checkers only once,
+    # instead of once per checker.
+    # forked workers inherit the cached file lists.
+    for dirname in {dirname for check in enabled_checks
+                    for dirname in checker_args[check][0]}:
+        listfiles(dirname)
+
+    # import the checker modules before forking, so the workers inherit
+    # them instead of importing them one by one. the imports run in
+    # threads so their file io overlaps.
+    with ThreadPoolExecutor(max_workers=len(checkers)) as import_pool:
+        list(import_pool.map(partial(importlib.import_module, package=__package__),
+                             [modname for modname, _, _ in checkers]))
+
+    # forked workers inherit the already-imported modules
+    if os.name == 'posix':
+        mp_context = multiprocessing.get_context('fork')
+    else:
+        mp_context = None
 
-    # pylint: disable=too-many-function-args, no-value-for-parameter
-    # no-value-for-parameter has to be used because pylint is dumb
-
-    if args.headerguards:
-        from .headerguards import find_issues
-        yield from find_issues('libopenage')
-
-    if args.authors:
-        from .authors import find_issues
-        yield from find_issues()
-
-    if args.pystyle:
-        from .pystyle import find_issues
-        yield from find_issues(check_files, ('openage', 'buildsystem', 'etc/gdb_pretty'))
-
-    if args.cython:
-        from buildsystem.codecompliance.cython import find_issues
-        yield from find_issues(check_files, ('openage',))
-
-    if args.cppstyle:
-        from .cppstyle import find_issues
-        yield from find_issues(check_files, ('libopenage',))
+    with ProcessPoolExecutor(max_workers=min(len(checkers), os.cpu_count() or 1),
+                             mp_context=mp_context) as pool:
+        jobs = [pool.submit(run_checker, modname, cache_dir, *checker_args)
+                for modname, cache_dir, checker_args in checkers]
 
-    if args.pylint:
-        from .pylint import find_issues
-        yield from find_issues(check_files, ('openage', 'buildsystem', 'etc/gdb_pretty'))
-
-    if args.textfiles:
-        from .textfiles import find_issues
-        yield from find_issues(
-            ('openage', 'libopenage', 'buildsystem', 'doc', 'legal', 'etc/gdb_pretty'),
-            ('.pxd', '.pyx', '.pxi', '.py',
-             '.h', '.cpp', '.template',
-             '', '.txt', '.md', '.conf',
-             '.cmake', '.in', '.yml', '.supp', '.desktop'))
-
-    if args.legal:
-        from .legal import find_issues
-        yield from find_issues(check_files,
-                               ('openage', 'buildsystem', 'libopenage', 'etc/gdb_pretty'),
-                               args.test_git_change_years)
-
-    if args.filemodes:
-        from .modes import find_issues
-        yield from find_issues(check_files, ('openage', 'buildsystem',
-                                             'libopenage', 'etc/gdb_pretty'))
-    if args.clang_tidy:
-        from .clangtidy import find_issues
-        yield from find_issues(check_files, ('libopenage', ))
+        for job in as_completed(jobs):
+            yield from job.result()
 
 
 if __name__ == '__main__':
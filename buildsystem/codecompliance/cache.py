@@ -0,0 +1,123 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Caches the issues of per-file checkers, keyed by the file contents.
+
+Unlike --only-changed-files, this needs no git history,
+so it also works in shallow clones.
+"""
+
+from functools import partial
+import hashlib
+import json
+import os
+import tempfile
+
+try:
+    from xxhash import xxh3_64 as content_hash
+except ImportError:
+    content_hash = partial(hashlib.blake2b, digest_size=8)
+
+from .util import findfiles
+
+
+def get_config_hash():
+    """
+    Hashes the checker sources, changes to them invalidate all cache entries.
+    """
+    digest = hashlib.sha1()
+
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    sources = sorted(os.path.join(package_dir, filename)
+                     for filename in os.listdir(package_dir)
+                     if filename.endswith('.py'))
+
+    for filename in sources:
+        with open(filename, 'rb') as fileobj:
+            digest.update(fileobj.read())
+
+    return digest.hexdigest()
+
+
+def load_entry(entry_name, config_hash):
+    """
+    Returns the cached list of (title, text) issues,
+    or None if there is no valid entry.
+    """
+    try:
+        with open(entry_name, encoding='utf8') as entry_file:
+            entry = json.load(entry_file)
+
+    except (OSError, ValueError):
+        return None
+
+    if entry.get("config_hash") != config_hash:
+        return None
+
+    return entry["issues"]
+
+
+def store_entry(entry_name, config_hash, issues):
+    """
+    Atomically writes the list of (title, text) issues to the cache.
+    """
+    with tempfile.NamedTemporaryFile('w', encoding='utf8',
+                                     dir=os.path.dirname(entry_name),
+                                     delete=False) as entry_file:
+        json.dump({"config_hash": config_hash, "issues": issues}, entry_file)
+
+    os.replace(entry_file.name, entry_name)
+
+
+def find_issues_cached(checker, cache_dir, check_files, dirnames):
+    """
+    Yields the cached issues of all files which have a valid entry in
+    cache_dir, and invokes checker.find_issues once for all other files.
+
+    The checker module must provide filter_file_list, its issues must
+    not carry fixes, and their texts must start with the file name
+    (as created by issue_str and issue_str_line).
+    """
+    if check_files is None:
+        check_files = findfiles(dirnames)
+
+    config_hash = get_config_hash()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # file name -> cache entry name, for the files without valid entry
+    missed_entries = {}
+
+    for filename in checker.filter_file_list(check_files, dirnames):
+        with open(filename, 'rb') as fileobj:
+            # issue texts contain the file name, so it's part of the key
+            key = content_hash(filename.encode() + b'\0' + fileobj.read()).hexdigest()
+
+        entry_name = os.path.join(cache_dir, key + '.json')
+        issues = load_entry(entry_name, config_hash)
+
+        if issues is None:
+            missed_entries[filename] = entry_name
+            continue
+
+        for title, text in issues:
+            yield title, text, None
+
+    if not missed_entries:
+        return
+
+    file_issues = {filename: [] for filename in missed_entries}
+    cacheable = True
+
+    for title, text, _ in checker.find_issues(set(missed_entries), dirnames):
+        yield title, text, None
+
+        filename = text.split('\n', 1)[0]
+        if filename in file_issues:
+            file_issues[filename].append((title, text))
+        else:
+            # can't tell which file it belongs to, so none is cached
+            cacheable = False
+
+    if cacheable:
+        for filename, issues in file_issues.items():
+            store_entry(missed_entries[filename], config_hash, issues)
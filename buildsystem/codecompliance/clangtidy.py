@@ -1,14 +1,37 @@
-# Copyright 2024-2024 the openage authors. See copying.md for legal info.
+# Copyright 2024-2026 the openage authors. See copying.md for legal info.
 
 """
 Checks clang-tidy errors on cpp files
 """
 
+import os
+import re
+import shutil
 import subprocess
 from .cppstyle import filter_file_list
 from .util import findfiles
 
 
+# build directory symlink created by ./configure,
+# contains the compile_commands.json database
+BUILD_DIR = 'bin'
+
+# first line of a clang-tidy diagnostic
+DIAGNOSTIC_RE = re.compile(r"^\S+:\d+:\d+: (warning|error):")
+
+# run-clang-tidy and clang-tidy status output, which is not part of a diagnostic:
+# progress, echoed clang-tidy invocations, headers and summaries
+STATUS_RE = re.compile(
+    r"^(\[\s*\d+/\d+\]"
+    r"|\S*clang-tidy(-\d+)?\s"
+    r"|Running clang-tidy "
+    r"|\d+ (warning|error)s?( and \d+ (warning|error)s?)? generated"
+    r"|Suppressed \d+ warnings"
+    r"|Use -header-filter"
+    r"|Error while processing )"
+)
+
+
 def find_issues(check_files, dirnames):
     """
     Invoke clang-tidy to check C++ files for issues.
@@ -25,9 +48,6 @@ def find_issues(check_files, dirnames):
     # Create the checks string
     checks = ', '.join(checks_to_include)
 
-    # Invocation command
-    invocation = ['clang-tidy', f'-checks=-*,{checks}']
-
     # Use utility functions from util.py and cppstyle.py
     if check_files is not None:
         filenames = list(filter_file_list(check_files, dirnames))
@@ -38,6 +58,95 @@ def find_issues(check_files, dirnames):
         print("No files to check.")
         return  # No files to check
 
+    compile_db = os.path.join(BUILD_DIR, 'compile_commands.json')
+    if shutil.which('run-clang-tidy') and os.path.isfile(compile_db):
+        # run-clang-tidy only knows the translation units
+        # from the compilation database, headers are checked one by one.
+        sources = [filename for filename in filenames if filename.endswith('.cpp')]
+        filenames = [filename for filename in filenames if not filename.endswith('.cpp')]
+
+        if sources:
+            yield from run_parallel(checks, sources)
+
+    yield from run_serial(checks, filenames)
+
+
+def run_parallel(checks, filenames):
+    """
+    Check the files with run-clang-tidy, which runs one clang-tidy
+    process per cpu.
+    """
+    # run-clang-tidy takes regexes that are matched against
+    # the file paths in the compilation database.
+    invocation = [
+        'run-clang-tidy',
+        '-j', str(os.cpu_count() or 1),
+        '-p', BUILD_DIR,
+        '-quiet',
+        f'-checks=-*,{checks}',
+    ] + [re.escape(filename) for filename in filenames]
+
+    print(f"Starting parallel clang-tidy check on {len(filenames)} files")
+    try:
+        with subprocess.Popen(
+            invocation,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True
+        ) as process:
+            # Stream diagnostics in real-time
+            for diagnostic in parse_diagnostics(process.stdout):
+                yield ("clang-tidy output", diagnostic, None)
+
+        if process.returncode != 0:
+            yield (
+                "clang-tidy error",
+                f"run-clang-tidy exited with code {process.returncode}",
+                None
+            )
+
+    # Handle exception
+    except subprocess.SubprocessError as exc:
+        yield (
+            "clang-tidy error",
+            f"An error occurred while running run-clang-tidy: {str(exc)}",
+            None
+        )
+
+
+def parse_diagnostics(lines):
+    """
+    Yields the diagnostics in the output lines of run-clang-tidy,
+    each with its notes and source code excerpts.
+
+    All other output is skipped.
+    """
+    diagnostic = None
+
+    for line in lines:
+        line = line.rstrip()
+
+        if DIAGNOSTIC_RE.match(line) or STATUS_RE.match(line):
+            if diagnostic:
+                yield "\n".join(diagnostic)
+
+            diagnostic = [line] if DIAGNOSTIC_RE.match(line) else None
+
+        elif diagnostic is not None and line:
+            # notes, source lines and carets of the current diagnostic
+            diagnostic.append(line)
+
+    if diagnostic:
+        yield "\n".join(diagnostic)
+
+
+def run_serial(checks, filenames):
+    """
+    Check the files with one clang-tidy invocation per file.
+    """
+    # Invocation command
+    invocation = ['clang-tidy', f'-checks=-*,{checks}']
+
     for filename in filenames:
         # Run clang-tidy for each file
         print(f"Starting clang-tidy check on file: {filename}")
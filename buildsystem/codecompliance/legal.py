@@ -1,10 +1,11 @@
-# Copyright 2014-2023 the openage authors. See copying.md for legal info.
+# Copyright 2014-2026 the openage authors. See copying.md for legal info.
 
 """
 Checks the legal headers of all files.
 """
 
 from datetime import date
+from functools import partial
 import re
 from subprocess import Popen, PIPE
 
@@ -92,36 +93,39 @@ def match_legalheader(data):
     raise ValueError("no match found")
 
 
-def create_year_fix(filename, file_content, expected_end_year,
-                    found_start_year, headertype):
+def create_year_fix(filename, expected_end_year, found_start_year, headertype):
     """
     Create a function that, when called, fixes the copyright header.
+
+    The fix is a partial of fix_year, so it can be sent back from
+    the checker worker process.
     """
 
     # check if a fix can be created
     if headertype not in {NATIVELEGALHEADER, THIRDPARTYLEGALHEADER}:
         return None
 
-    def year_fix_function():
-        """
-        Store the file with correct copyright years.
-        """
+    return partial(fix_year, filename, expected_end_year, found_start_year)
 
-        fixed_file, success = re.subn(
-            OPENAGE_AUTHORS,
-            OPENAGE_AUTHORTEMPLATE.format(crstart=found_start_year,
-                                          crend=expected_end_year),
-            file_content
-        )
 
-        if not success:
-            raise ValueError("copyright year fix did not suceeed")
+def fix_year(filename, expected_end_year, found_start_year):
+    """
+    Store the file with correct copyright years.
+    """
+
+    fixed_file, success = re.subn(
+        OPENAGE_AUTHORS,
+        OPENAGE_AUTHORTEMPLATE.format(crstart=found_start_year,
+                                      crend=expected_end_year),
+        readfile(filename)
+    )
 
-        writefile(filename, fixed_file)
+    if not success:
+        raise ValueError("copyright year fix did not suceeed")
 
-        return f"Copyright for {filename} was fixed."
+    writefile(filename, fixed_file)
 
-    return year_fix_function
+    return f"Copyright for {filename} was fixed."
 
 
 def test_headers(check_files, paths, git_change_years, third_party_files):
@@ -175,7 +179,6 @@ def test_headers(check_files, paths, git_change_years, third_party_files):
 
             fix = create_year_fix(
                 filename,
-                file_content,
                 expected_end_year,
                 found_start_year,
                 headertype
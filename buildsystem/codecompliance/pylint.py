@@ -1,4 +1,4 @@
-# Copyright 2015-2023 the openage authors. See copying.md for legal info.
+# Copyright 2015-2026 the openage authors. See copying.md for legal info.
 
 """
 Checks the Python modules with pylint.
@@ -16,13 +16,15 @@ def find_pyx_modules(dirnames):
         yield pyx_file.replace('/', '.')[:-len(".pyx")]
 
 
-def find_issues(check_files, dirnames):
-    """ Invokes the external utility. """
+def find_issues(check_files, dirnames, jobs=0):
+    """
+    Invokes the external utility.
 
-    invocation = ['--rcfile=etc/pylintrc', '--reports=n']
+    jobs is the number of parallel pylint processes,
+    0 lets pylint use all available cpus.
+    """
 
-    from multiprocessing import cpu_count
-    invocation.append(f"--jobs={cpu_count():d}")
+    invocation = ['--rcfile=etc/pylintrc', '--reports=n', f"--jobs={jobs:d}"]
 
     if check_files is None:
         invocation.extend(dirnames)
@@ -1,4 +1,4 @@
-# Copyright 2014-2023 the openage authors. See copying.md for legal info.
+# Copyright 2014-2026 the openage authors. See copying.md for legal info.
 
 """
 Some utilities.
@@ -11,6 +11,7 @@ import os
 SHEBANG = "#!/.*\n(#?\n)?"
 
 FILECACHE = {}
+FILELISTCACHE = {}
 BADUTF8FILES = set()
 
 
@@ -110,18 +111,43 @@ def findfiles(paths, exts=None):
     hidden dirs and files are ignored.
     """
     for path in paths:
-        for filename in os.listdir(path):
-            if filename.startswith('.'):
+        for filename in listfiles(path):
+            if exts is None or has_ext(filename, exts):
+                yield filename
+
+
+def listfiles(path):
+    """
+    returns a tuple of all files below path, hidden dirs and files excluded.
+
+    the directory tree is only walked once, later calls return
+    the result from the cache.
+    """
+    if path not in FILELISTCACHE:
+        FILELISTCACHE[path] = tuple(scanfiles(path))
+
+    return FILELISTCACHE[path]
+
+
+def scanfiles(path):
+    """
+    yields all files below path, hidden dirs and files excluded.
+
+    uses os.scandir, which knows the entry types without
+    an extra stat call per entry.
+    """
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
                 continue
 
-            filename = os.path.join(path, filename)
+            filename = os.path.join(path, entry.name)
 
-            if os.path.isdir(filename):
-                yield from findfiles((filename,), exts)
+            if entry.is_dir():
+                yield from scanfiles(filename)
                 continue
 
-            if exts is None or has_ext(filename, exts):
-                yield filename
+            yield filename
 
 
 def issue_str(title, filename, fix=None):
@@ -1,4 +1,4 @@
-# Copyright 2015-2024 the openage authors. See copying.md for legal info.
+# Copyright 2015-2026 the openage authors. See copying.md for legal info.
 #
 # pylint: disable=too-many-branches
 """
@@ -211,7 +211,7 @@ def init_subparser(cli: ArgumentParser):
 
     cli.add_argument(
         "--no-pickle-cache", action='store_true',
-        help="don't use a pickle file to skip the dat file reading.")
+        help="don't use a cache file to skip the dat file reading.")
 
     cli.add_argument(
         "--jobs", "-j", type=int, default=None)
@@ -1,4 +1,4 @@
-# Copyright 2020-2024 the openage authors. See copying.md for legal info.
+# Copyright 2020-2026 the openage authors. See copying.md for legal info.
 
 """
 Module for reading .dat files.
@@ -6,14 +6,20 @@ Module for reading .dat files.
 from __future__ import annotations
 import typing
 
+from functools import cache
+import glob
+import hashlib
+import mmap
 import os
-import pickle
 from tempfile import gettempdir
-from zlib import decompress
+import zlib
 
 from ....log import spam, dbg, info, warn
+from ....util.hash import hash_file
+from ...value_object.read import genie_structure
 from ...value_object.read.media.datfile.empiresdat import EmpiresDatWrapper
 from ...value_object.read.media_types import MediaType
+from . import gamespec_cache
 
 if typing.TYPE_CHECKING:
     from openage.convert.value_object.init.game_version import GameVersion
@@ -22,6 +28,10 @@ if typing.TYPE_CHECKING:
     from openage.util.fslike.wrapper import GuardedFile
 
 
+# size of the compressed chunks that are read from the .dat file
+DECOMPRESS_CHUNK_SIZE = 1024 * 1024
+
+
 def get_gamespec(srcdir: Directory, game_version: GameVersion, pickle_cache: bool) -> ArrayMember:
     """
     Reads empires.dat file.
@@ -40,8 +50,20 @@ def get_gamespec(srcdir: Directory, game_version: GameVersion, pickle_cache: boo
         raise RuntimeError("No service found for reading data file of "
                            f"version {game_version.edition.game_id}")
 
-    cache_file = os.path.join(
-        gettempdir(), f"{game_version.edition.game_id}_{filepath.name}.pickle")
+    cache_file = None
+    if pickle_cache:
+        # the hashes of the dat file and the parser are part of the name,
+        # so a changed dat file or struct definition never picks up
+        # the cache of its previous version.
+        dat_hash = hash_file(filepath, hash_algo="sha1", bufsize=DECOMPRESS_CHUNK_SIZE)
+        cache_prefix = os.path.join(gettempdir(),
+                                    f"{game_version.edition.game_id}_{filepath.name}")
+        cache_file = f"{cache_prefix}.{dat_hash}.{get_parser_hash()}.npz"
+
+        if not os.path.exists(cache_file):
+            # a new cache file will be written,
+            # the ones of previous versions are never used again.
+            remove_stale_cache_files(cache_prefix)
 
     with filepath.open('rb') as empiresdat_file:
         gamespec = load_gamespec(empiresdat_file,
@@ -52,6 +74,44 @@ def get_gamespec(srcdir: Directory, game_version: GameVersion, pickle_cache: boo
     return gamespec
 
 
+def remove_stale_cache_files(cache_prefix: str) -> None:
+    """
+    Remove the cache files of previous dat file and parser versions,
+    including the pickle file from before the current cache format.
+    """
+    stale_files = glob.glob(f"{glob.escape(cache_prefix)}.*.npz")
+    stale_files.append(f"{cache_prefix}.pickle")
+
+    for stale_file in stale_files:
+        try:
+            os.remove(stale_file)
+            dbg("removed stale cache file: %s", stale_file)
+
+        except FileNotFoundError:
+            pass
+
+
+@cache
+def get_parser_hash() -> str:
+    """
+    Return a hash of the sources of the dat file parser, the struct
+    definitions and the cache format.
+    """
+    digest = hashlib.sha1()
+
+    read_dir = os.path.dirname(genie_structure.__file__)
+    sources = [gamespec_cache.__file__]
+    for dirpath, _, filenames in os.walk(read_dir):
+        sources.extend(os.path.join(dirpath, filename)
+                       for filename in filenames if filename.endswith(".py"))
+
+    for source in sorted(sources):
+        with open(source, "rb") as source_file:
+            digest.update(source_file.read())
+
+    return digest.hexdigest()[:16]
+
+
 def load_gamespec(
     fileobj: GuardedFile,
     game_version: GameVersion,
@@ -70,11 +130,11 @@ def load_gamespec(
     if cachefile_name:
         try:
             with open(cachefile_name, "rb") as cachefile:
-                # pickle.load() can fail in many ways, we need to catch all.
+                # loading can fail in many ways, we need to catch all.
                 # pylint: disable=broad-except
                 try:
                     info("using cached wrapper: %s", cachefile_name)
-                    gamespec = pickle.load(cachefile)
+                    gamespec = gamespec_cache.load_gamespec(cachefile)
                     return gamespec
                 except Exception:
                     warn("could not use cached wrapper:")
@@ -87,15 +147,10 @@ def load_gamespec(
 
     # read the file ourselves
 
-    dbg("reading dat file")
-    compressed_data = fileobj.read()
+    dbg("reading and decompressing dat file")
+    file_data = decompress_datfile(fileobj)
     fileobj.close()
 
-    dbg("decompressing dat file")
-    # -15: there's no header, window size is 15.
-    file_data = decompress(compressed_data, -15)
-    del compressed_data
-
     spam("length of decompressed data: %d", len(file_data))
 
     wrapper = EmpiresDatWrapper()
@@ -107,7 +162,54 @@ def load_gamespec(
 
     if cachefile_name and pickle_cache:
         dbg("dumping dat file contents to cache file: %s", cachefile_name)
-        with open(cachefile_name, "wb") as cachefile:
-            pickle.dump(gamespec, cachefile)
+        try:
+            with open(cachefile_name, "wb") as cachefile:
+                gamespec_cache.save_gamespec(gamespec, cachefile)
+
+        except (TypeError, OverflowError) as exc:
+            warn("could not write cache file: %s", exc)
+            os.remove(cachefile_name)
 
     return gamespec
+
+
+def decompress_datfile(fileobj: GuardedFile) -> bytearray:
+    """
+    Decompress the contents of a 'empires.dat' file.
+
+    The file is read in chunks, so the whole compressed data
+    never has to be in memory next to the decompressed data.
+    Real files are memory-mapped, then the chunks are views
+    on the mapping instead of copies.
+    """
+    # -15: there's no header, window size is 15.
+    decompressor = zlib.decompressobj(-15)
+    file_data = bytearray()
+
+    try:
+        mapping = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+
+    except (AttributeError, OSError, ValueError):
+        # no real file (e.g. a wrapped or in-memory one) or an empty file
+        mapping = None
+
+    if mapping is not None:
+        with mapping, memoryview(mapping) as view:
+            for pos in range(fileobj.tell(), len(view), DECOMPRESS_CHUNK_SIZE):
+                file_data += decompressor.decompress(view[pos:pos + DECOMPRESS_CHUNK_SIZE])
+
+    else:
+        while True:
+            chunk = fileobj.read(DECOMPRESS_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            file_data += decompressor.decompress(chunk)
+
+    file_data += decompressor.flush()
+
+    # unlike zlib.decompress, the decompressor accepts incomplete data
+    if not decompressor.eof:
+        raise zlib.error("incomplete or truncated stream in dat file")
+
+    return file_data
@@ -0,0 +1,190 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Cache file format for the parsed contents of the 'empires.dat' file.
+
+The value member tree is flattened in pre-order into a few
+numpy arrays, which are stored uncompressed with numpy.savez.
+Loading decodes each array in one go and then rebuilds the
+member objects, instead of unpickling them one by one.
+"""
+from __future__ import annotations
+import typing
+
+import numpy
+
+from ...value_object.read.value_members import IntMember, FloatMember, \
+    BooleanMember, IDMember, BitfieldMember, StringMember, ContainerMember, \
+    ArrayMember, StorageType, ValueMember
+
+
+# increase when the layout of the cache file changes
+CACHE_FORMAT_VERSION = 1
+
+# member classes, indexed by the type code stored in the cache
+MEMBER_TYPES = (
+    IntMember,
+    FloatMember,
+    BooleanMember,
+    IDMember,
+    BitfieldMember,
+    StringMember,
+    ContainerMember,
+    ArrayMember,
+)
+TYPE_CODES = {member_type: code for code, member_type in enumerate(MEMBER_TYPES)}
+
+# array storage types, indexed by the code stored in the cache
+ARRAY_TYPES = tuple(StorageType)
+ARRAY_TYPE_CODES = {storage_type: code for code, storage_type in enumerate(ARRAY_TYPES)}
+
+# array storage type -> type of the array members
+ARRAY_MEMBER_TYPES = {
+    StorageType.ARRAY_INT: StorageType.INT_MEMBER,
+    StorageType.ARRAY_FLOAT: StorageType.FLOAT_MEMBER,
+    StorageType.ARRAY_BOOL: StorageType.BOOLEAN_MEMBER,
+    StorageType.ARRAY_ID: StorageType.ID_MEMBER,
+    StorageType.ARRAY_BITFIELD: StorageType.BITFIELD_MEMBER,
+    StorageType.ARRAY_STRING: StorageType.STRING_MEMBER,
+    StorageType.ARRAY_CONTAINER: StorageType.CONTAINER_MEMBER,
+}
+
+# names and strings are joined with this separator.
+# strings from the dat file are cut at the first null byte,
+# so they can't contain it.
+SEPARATOR = "\0"
+
+
+def save_gamespec(gamespec: ValueMember, fileobj: typing.BinaryIO) -> None:
+    """
+    Store the gamespec in the cache file.
+
+    Raises TypeError if the gamespec contains members
+    that can't be stored, e.g. dynamically loaded ones.
+    """
+    types = []
+    names = []
+    values = []
+    array_types = []
+    floats = []
+    strings = []
+
+    name_ids = {}
+
+    stack = [gamespec]
+    while stack:
+        member = stack.pop()
+
+        # the value members are abstract base classes, so comparing
+        # the exact type is a lot faster than isinstance()
+        member_type = type(member)
+        type_code = TYPE_CODES.get(member_type)
+        if type_code is None:
+            raise TypeError(f"can't cache member {member!r} of type {member_type}")
+
+        types.append(type_code)
+        names.append(name_ids.setdefault(member.name, len(name_ids)))
+
+        if member_type is ContainerMember:
+            if not isinstance(member.value, dict):
+                raise TypeError(f"can't cache dynamically loaded member {member!r}")
+
+            submembers = list(member.value.values())
+            values.append(len(submembers))
+
+            # reversed, so that they are popped in order
+            stack.extend(reversed(submembers))
+
+        elif member_type is ArrayMember:
+            array_types.append(ARRAY_TYPE_CODES[member.get_type()])
+            values.append(len(member.value))
+            stack.extend(reversed(member.value))
+
+        elif member_type is FloatMember:
+            values.append(len(floats))
+            floats.append(member.value)
+
+        elif member_type is StringMember:
+            values.append(len(strings))
+            strings.append(member.value)
+
+        else:
+            values.append(member.value)
+
+    numpy.savez(
+        fileobj,
+        version=numpy.array(CACHE_FORMAT_VERSION),
+        types=numpy.array(types, dtype=numpy.uint8),
+        names=numpy.array(names, dtype=numpy.uint32),
+        values=numpy.array(values, dtype=numpy.int64),
+        array_types=numpy.array(array_types, dtype=numpy.uint8),
+        floats=numpy.array(floats, dtype=numpy.float64),
+        name_table=_encode_strings(name_ids),
+        string_table=_encode_strings(strings),
+    )
+
+
+def load_gamespec(fileobj: typing.BinaryIO) -> ValueMember:
+    """
+    Load the gamespec from a cache file created with save_gamespec.
+
+    Raises ValueError if the file has an unknown format.
+    """
+    # pylint doesn't know the type of the arrays in the npz file
+    # pylint: disable=no-member
+    with numpy.load(fileobj, allow_pickle=False) as cache:
+        version = int(cache["version"])
+        if version != CACHE_FORMAT_VERSION:
+            raise ValueError(f"cache format version {version} "
+                             f"is not {CACHE_FORMAT_VERSION}")
+
+        types = iter(cache["types"].tolist())
+        names = iter(cache["names"].tolist())
+        values = iter(cache["values"].tolist())
+        array_types = iter(cache["array_types"].tolist())
+        floats = cache["floats"].tolist()
+        name_table = _decode_strings(cache["name_table"])
+        string_table = _decode_strings(cache["string_table"])
+
+    def build():
+        member_type = MEMBER_TYPES[next(types)]
+        name = name_table[next(names)]
+        value = next(values)
+
+        if member_type is ContainerMember:
+            submembers = {}
+            for _ in range(value):
+                submember = build()
+                submembers[submember.name] = submember
+
+            return ContainerMember(name, submembers)
+
+        if member_type is ArrayMember:
+            member_storage_type = ARRAY_MEMBER_TYPES[ARRAY_TYPES[next(array_types)]]
+            submembers = [build() for _ in range(value)]
+
+            return ArrayMember(name, member_storage_type, submembers)
+
+        if member_type is FloatMember:
+            return FloatMember(name, floats[value])
+
+        if member_type is StringMember:
+            return StringMember(name, string_table[value])
+
+        return member_type(name, value)
+
+    return build()
+
+
+def _encode_strings(strings) -> numpy.ndarray:
+    """
+    Join the strings into one utf-8 encoded byte array.
+    """
+    return numpy.frombuffer(SEPARATOR.join(strings).encode('utf-8'), dtype=numpy.uint8)
+
+
+def _decode_strings(data: numpy.ndarray) -> list[str]:
+    """
+    Split a byte array created by _encode_strings into the strings.
+    """
+    return data.tobytes().decode('utf-8').split(SEPARATOR)
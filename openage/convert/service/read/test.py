@@ -0,0 +1,167 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Tests for reading the dat file and for the gamespec cache file format.
+"""
+
+from io import BytesIO
+import random
+from tempfile import TemporaryFile
+import zlib
+
+from openage.testing.testing import assert_value, assert_raises, result
+
+from ...value_object.read.dynamic_loader import DynamicLoader
+from ...value_object.read.genie_structure import GenieStructure
+from ...value_object.read.value_members import IntMember, FloatMember, \
+    BooleanMember, IDMember, BitfieldMember, StringMember, ContainerMember, \
+    ArrayMember, StorageType, member_tree
+from .gamedata import DECOMPRESS_CHUNK_SIZE, decompress_datfile
+from .gamespec_cache import MEMBER_TYPES, save_gamespec, load_gamespec
+
+
+def member_types(member):
+    """
+    Yields the types of member and all of its submembers.
+    """
+    yield type(member)
+
+    if isinstance(member, ContainerMember):
+        submembers = member.value.values()
+    elif isinstance(member, ArrayMember):
+        submembers = member.value
+    else:
+        submembers = ()
+
+    for submember in submembers:
+        yield from member_types(submember)
+
+
+def roundtrip(gamespec):
+    """
+    Stores gamespec in a cache file and loads it again.
+    """
+    cachefile = BytesIO()
+    save_gamespec(gamespec, cachefile)
+    cachefile.seek(0)
+
+    return load_gamespec(cachefile)
+
+
+def test_roundtrip():
+    """
+    Every member type, nested containers and arrays survive the cache.
+    """
+    gamespec = ContainerMember("", [
+        IntMember("int", -5),
+        IntMember("large_int", 2 ** 40),
+        FloatMember("float", 0.25),
+        BooleanMember("bool", 1),
+        IDMember("id", -1),
+        BitfieldMember("bitfield", 0b1010),
+        StringMember("string", "überschrift"),
+        StringMember("empty_string", ""),
+        ArrayMember("ints", StorageType.INT_MEMBER,
+                    [IntMember("ints", value) for value in range(3)]),
+        ArrayMember("empty_floats", StorageType.FLOAT_MEMBER, []),
+        ArrayMember("containers", StorageType.CONTAINER_MEMBER, [
+            ContainerMember("", [
+                ArrayMember("strings", StorageType.STRING_MEMBER,
+                            [StringMember("strings", "a"), StringMember("strings", "")]),
+                ContainerMember("empty_container", []),
+            ]),
+            ContainerMember("", []),
+        ]),
+    ])
+    assert_value(set(member_types(gamespec)), set(MEMBER_TYPES))
+    assert_value(member_tree(roundtrip(gamespec)), member_tree(gamespec))
+
+    # no strings and no floats, so their tables are empty
+    gamespec = ArrayMember("", StorageType.ID_MEMBER, [IDMember("", 7)])
+    assert_value(member_tree(roundtrip(gamespec)), member_tree(gamespec))
+
+
+def test_dynamic_loader():
+    """
+    Dynamically loaded members can't be cached.
+    """
+    loader = DynamicLoader("", GenieStructure, None, b"", 0)
+    gamespec = ContainerMember("", [ContainerMember("loaded", loader)])
+
+    with assert_raises(TypeError):
+        result(save_gamespec(gamespec, BytesIO()))
+
+
+def compress_datfile(data):
+    """
+    Compresses data like the dat files are: raw deflate without header.
+    """
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress_both(compressed, prefix=b""):
+    """
+    Decompresses the data after prefix from a real file,
+    which is memory-mapped, and from a BytesIO, which is read in chunks.
+    The files are positioned right after prefix.
+
+    Returns the results of both.
+    """
+    results = []
+
+    with TemporaryFile() as datfile:
+        datfile.write(prefix + compressed)
+        datfile.seek(len(prefix))
+        results.append(decompress_datfile(datfile))
+
+    datfile = BytesIO(prefix + compressed)
+    datfile.seek(len(prefix))
+    results.append(decompress_datfile(datfile))
+
+    return results
+
+
+def test_decompress_datfile():
+    """
+    Both ways of reading the dat file give the decompressed data.
+    """
+    # random data doesn't compress, so it spans multiple chunks
+    data = random.Random(1).randbytes(2 * DECOMPRESS_CHUNK_SIZE + 1234) * 2
+    compressed = compress_datfile(data)
+    assert_value(len(compressed) > 2 * DECOMPRESS_CHUNK_SIZE, True)
+
+    assert_value(decompress_both(compressed), [data, data])
+    assert_value(decompress_both(compressed, b"prefix"), [data, data])
+
+    # a stream without data
+    assert_value(decompress_both(compress_datfile(b"")), [b"", b""])
+
+
+def test_decompress_datfile_errors():
+    """
+    Truncated and empty dat files are rejected.
+    """
+    compressed = compress_datfile(random.Random(2).randbytes(DECOMPRESS_CHUNK_SIZE))
+
+    for broken in (compressed[:len(compressed) // 2], b""):
+        with TemporaryFile() as datfile:
+            datfile.write(broken)
+            datfile.seek(0)
+
+            with assert_raises(zlib.error):
+                result(decompress_datfile(datfile))
+
+        with assert_raises(zlib.error):
+            result(decompress_datfile(BytesIO(broken)))
+
+
+def test():
+    """
+    Tests for reading the dat file, and storing and loading the gamespec cache.
+    """
+    test_decompress_datfile()
+    test_decompress_datfile_errors()
+    test_roundtrip()
+    test_dynamic_loader()
@@ -1,14 +1,17 @@
-# Copyright 2014-2024 the openage authors. See copying.md for legal info.
+# Copyright 2014-2026 the openage authors. See copying.md for legal info.
 
-# TODO pylint: disable=C,R
+# TODO pylint: disable=C,R,too-many-lines
 
 from __future__ import annotations
 import typing
 
+from functools import cache
 import math
 import re
 import struct
 
+import numpy
+
 from openage.convert.value_object.read.dynamic_loader import DynamicLoader
 
 from ....util.strings import decode_until_null
@@ -57,6 +60,103 @@ STRUCT_TYPE_LOOKUP = {
     "char[]":             "s",
 }
 
+# type lookup for python struct -> numpy dtype
+NUMPY_TYPE_LOOKUP = {
+    "b": "i1",
+    "B": "u1",
+    "h": "<i2",
+    "H": "<u2",
+    "i": "<i4",
+    "I": "<u4",
+    "l": "<i4",
+    "L": "<u4",
+    "q": "<i8",
+    "Q": "<u8",
+    "f": "<f4",
+    "d": "<f8",
+}
+
+# storage type -> ValueMember class for single values
+# that can be read in bulk
+SCALAR_MEMBER_TYPES = {
+    StorageType.INT_MEMBER: IntMember,
+    StorageType.FLOAT_MEMBER: FloatMember,
+    StorageType.BOOLEAN_MEMBER: BooleanMember,
+    StorageType.ID_MEMBER: IDMember,
+}
+
+# storage type -> ValueMember class for enum lookups
+# that store the raw value and can be read in bulk
+ENUM_MEMBER_TYPES = {
+    StorageType.INT_MEMBER: IntMember,
+    StorageType.ID_MEMBER: IDMember,
+    StorageType.BITFIELD_MEMBER: BitfieldMember,
+}
+
+# storage type -> (storage type of the elements, ValueMember class)
+# for arrays that can be read in bulk
+ARRAY_MEMBER_TYPES = {
+    StorageType.ARRAY_INT: (StorageType.INT_MEMBER, IntMember),
+    StorageType.ARRAY_FLOAT: (StorageType.FLOAT_MEMBER, FloatMember),
+    StorageType.ARRAY_BOOL: (StorageType.BOOLEAN_MEMBER, BooleanMember),
+    StorageType.ARRAY_ID: (StorageType.ID_MEMBER, IDMember),
+}
+
+
+@cache
+def parse_type_definition(var_type: str) -> tuple[str, typing.Union[int, str, None]]:
+    """
+    Split a type definition like "int32_t" or "char[name_len]" into
+    the C type and the array length.
+
+    The length is None for non-arrays, an int for fixed-size arrays
+    and the name of the length member for dynamic arrays.
+
+    The definitions are the same for every struct instance,
+    so they are only parsed once.
+    """
+    is_array = VARARRAY_MATCH.match(var_type)
+
+    if not is_array:
+        return var_type, None
+
+    struct_type = is_array.group(1)
+    data_count = is_array.group(2)
+    if struct_type == "char":
+        struct_type = "char[]"
+
+    if INTEGER_MATCH.match(data_count):
+        # integer length
+        data_count = int(data_count)
+
+    return struct_type, data_count
+
+
+@cache
+def get_struct(data_count: int, symbol: str) -> struct.Struct:
+    """
+    Return the compiled little-endian struct for reading
+    data_count values of the python struct type symbol.
+    """
+    return struct.Struct("< %d%s" % (data_count, symbol))
+
+
+@cache
+def get_fixed_size(var_type: str) -> typing.Optional[int]:
+    """
+    Return the size in bytes of a type definition like "int32_t"
+    or "char[16]", or None if the size is not known beforehand.
+    """
+    struct_type, data_count = parse_type_definition(var_type)
+
+    if struct_type not in STRUCT_TYPE_LOOKUP or isinstance(data_count, str):
+        return None
+
+    if data_count is None:
+        data_count = 1
+
+    return get_struct(data_count, STRUCT_TYPE_LOOKUP[struct_type]).size
+
 
 class GenieStructure:
     """
@@ -96,13 +196,7 @@ class GenieStructure:
         stop_reading_members = False
 
         if not members:
-            members = target_class.get_data_format(game_version,
-                                                   allowed_modes=(True,
-                                                                  READ,
-                                                                  READ_GEN,
-                                                                  READ_UNKNOWN,
-                                                                  SKIP),
-                                                   flatten_includes=False)
+            members = target_class.get_read_members(game_version)
 
         # Save the start offset in case dynamic loading is active
         # we still need to read over the whole structure to know
@@ -114,6 +208,10 @@ class GenieStructure:
                 export = READ
 
             if stop_reading_members:
+                if export == SKIP:
+                    # skipped members are never stored
+                    continue
+
                 if isinstance(var_type, ReadMember):
                     replacement_value = var_type.get_empty_value()
                 else:
@@ -122,6 +220,14 @@ class GenieStructure:
                 setattr(self, var_name, replacement_value)
                 continue
 
+            if export == SKIP and isinstance(var_type, str):
+                skip_size = get_fixed_size(var_type)
+
+                if skip_size is not None:
+                    # nothing to unpack, just jump over the data
+                    offset += skip_size
+                    continue
+
             if isinstance(var_type, GroupMember):
                 offset, gen_members = self._read_group(
                     raw, offset, game_version, export,
@@ -264,6 +370,26 @@ class GenieStructure:
         else:
             offset_lookup = None
 
+        if single_type_subdata and not offset_lookup and list_len > 0:
+            new_data_class = var_type.class_lookup[None]
+
+            if issubclass(new_data_class, GenieStructure):
+                fixed_layout = new_data_class.get_fixed_layout(game_version)
+
+                if (fixed_layout is not None and
+                        offset + list_len * fixed_layout[0].itemsize <= len(raw)):
+                    offset = self._read_fixed_subdata(
+                        raw, offset, list_len, fixed_layout, new_data_class,
+                        varargs, getattr(self, var_name),
+                        subdata_value_members if export == READ_GEN else None
+                    )
+
+                    if export == READ_GEN:
+                        array = ArrayMember(var_name, allowed_member_type, subdata_value_members)
+                        generated_value_members.append(array)
+
+                    return offset, generated_value_members
+
         for i in range(list_len):
 
             # List of subtype members filled if there's a subtype to be read
@@ -342,6 +468,87 @@ class GenieStructure:
 
         return offset, generated_value_members
 
+    @staticmethod
+    def _read_fixed_subdata(
+        raw: bytes,
+        offset: int,
+        list_len: int,
+        fixed_layout: tuple,
+        new_data_class: type,
+        varargs: dict,
+        subdata_list: list,
+        subdata_value_members: list = None
+    ) -> int:
+        """
+        Read list_len consecutive structs of new_data_class, which has a fixed
+        layout (see get_fixed_layout), with one numpy call instead of
+        reading them member by member.
+
+        The structs are appended to subdata_list. If subdata_value_members
+        is given, a ContainerMember for each struct is appended to it.
+        """
+        dtype, fields = fixed_layout
+        rows = numpy.frombuffer(raw, dtype=dtype, count=list_len, offset=offset).tolist()
+
+        for row in rows:
+            new_data = new_data_class(**varargs)
+            gen_members = []
+
+            for field, result in zip(fields, row):
+                export, var_name, storage_type, symbol, is_array, lookup, field_offset = field
+
+                if export == READ_UNKNOWN:
+                    var_name = "unknown-0x%08x" % (offset + field_offset)
+
+                if symbol == "s":
+                    result = decode_until_null(result)
+
+                    if export == READ_GEN:
+                        gen_members.append(StringMember(var_name, result))
+
+                elif is_array:
+                    if export == READ_GEN:
+                        allowed_member_type, member_type = ARRAY_MEMBER_TYPES[storage_type]
+                        array_members = [member_type(var_name, elem) for elem in result]
+                        gen_members.append(ArrayMember(var_name, allowed_member_type,
+                                                       array_members))
+
+                    result = tuple(result)
+
+                else:
+                    if symbol == "f":
+                        if not math.isfinite(result):
+                            raise SyntaxError("invalid float when "
+                                              "reading %s at offset %# 08x" % (
+                                                  var_name, offset + field_offset))
+
+                    if lookup is not None:
+                        lookup_result = lookup.entry_hook(result)
+
+                        if export == READ_GEN:
+                            if storage_type is StorageType.STRING_MEMBER:
+                                gen_members.append(StringMember(var_name, lookup_result))
+
+                            else:
+                                gen_members.append(ENUM_MEMBER_TYPES[storage_type](var_name,
+                                                                                   result))
+
+                        result = lookup_result
+
+                    elif export == READ_GEN:
+                        gen_members.append(SCALAR_MEMBER_TYPES[storage_type](var_name, result))
+
+                setattr(new_data, var_name, result)
+
+            subdata_list.append(new_data)
+
+            if subdata_value_members is not None:
+                subdata_value_members.append(ContainerMember("", gen_members))
+
+            offset += dtype.itemsize
+
+        return offset
+
     def _read_primitive(
         self,
         raw: bytes,
@@ -362,18 +569,11 @@ class GenieStructure:
         is_custom_member = False
 
         if isinstance(var_type, str):
-            is_array = VARARRAY_MATCH.match(var_type)
+            struct_type, data_count = parse_type_definition(var_type)
+            is_array = data_count is not None
 
             if is_array:
-                struct_type = is_array.group(1)
-                data_count = is_array.group(2)
-                if struct_type == "char":
-                    struct_type = "char[]"
-
-                if INTEGER_MATCH.match(data_count):
-                    # integer length
-                    data_count = int(data_count)
-                else:
+                if isinstance(data_count, str):
                     # dynamic length specified by member name
                     data_count = getattr(self, data_count)
 
@@ -389,7 +589,6 @@ class GenieStructure:
                                       % (var_name, offset, var_type, storage_type))
 
             else:
-                struct_type = var_type
                 data_count = 1
 
         elif isinstance(var_type, ReadMember):
@@ -421,10 +620,10 @@ class GenieStructure:
         symbol = STRUCT_TYPE_LOOKUP[struct_type]
 
         # read that stuff!!11
-        struct_format = "< %d%s" % (data_count, symbol)
+        member_struct = get_struct(data_count, symbol)
 
         if export != SKIP:
-            result = struct.unpack_from(struct_format, raw, offset)
+            result = member_struct.unpack_from(raw, offset)
 
             if is_custom_member:
                 if not var_type.verify_read_data(self, result):
@@ -598,7 +797,7 @@ class GenieStructure:
             setattr(self, var_name, result)
 
         # increase the current file position by the size we just read
-        offset += struct.calcsize(struct_format)
+        offset += member_struct.size
 
         return offset, generated_value_members, stop_reading_members
 
@@ -645,6 +844,148 @@ class GenieStructure:
             member_entry = (is_parent,) + member
             yield member_entry
 
+    @classmethod
+    @cache
+    def get_read_members(cls, game_version: GameVersion) -> tuple:
+        """
+        Return the members that read() parses from the binary data.
+
+        Runs of consecutive SKIP members with a fixed size are merged
+        into one unnamed char array, so read() can jump over them at once.
+
+        The result only depends on the game version, so it is cached
+        instead of being filtered again for every struct that is read.
+        """
+        members = []
+        skip_size = 0
+
+        for member in cls.get_data_format(game_version,
+                                          allowed_modes=(True,
+                                                         READ,
+                                                         READ_GEN,
+                                                         READ_UNKNOWN,
+                                                         SKIP),
+                                          flatten_includes=False):
+            _, export, _, _, var_type = member
+
+            if export == SKIP and isinstance(var_type, str):
+                member_size = get_fixed_size(var_type)
+
+                if member_size is not None:
+                    skip_size += member_size
+                    continue
+
+            if skip_size:
+                members.append((False, SKIP, None, None, "char[%d]" % skip_size))
+                skip_size = 0
+
+            members.append(member)
+
+        if skip_size:
+            members.append((False, SKIP, None, None, "char[%d]" % skip_size))
+
+        return tuple(members)
+
+    @classmethod
+    @cache
+    def get_fixed_layout(cls, game_version: GameVersion) -> typing.Optional[tuple]:
+        """
+        Return the layout of this struct if it only consists of plain values,
+        enum lookups and arrays of fixed length, i.e. every instance
+        has the same size.
+
+        The layout is a tuple of the numpy dtype for reading the struct
+        and a tuple of
+        (export, var_name, storage_type, symbol, is_array, lookup, field_offset)
+        for every member that is not skipped.
+        Returns None if the struct can't be read with such a layout.
+        """
+        names = []
+        formats = []
+        offsets = []
+        fields = []
+        struct_size = 0
+
+        for _, export, var_name, storage_type, var_type in cls.get_read_members(game_version):
+            if export == SKIP and isinstance(var_type, str):
+                skip_size = get_fixed_size(var_type)
+
+                if skip_size is None:
+                    return None
+
+                struct_size += skip_size
+                continue
+
+            lookup = None
+
+            if isinstance(var_type, EnumLookupMember):
+                if storage_type not in ENUM_MEMBER_TYPES and \
+                        storage_type is not StorageType.STRING_MEMBER:
+                    return None
+
+                lookup = var_type
+                struct_type = var_type.raw_type
+                data_count = None
+
+            elif isinstance(var_type, str):
+                struct_type, data_count = parse_type_definition(var_type)
+
+            else:
+                return None
+
+            if struct_type not in STRUCT_TYPE_LOOKUP:
+                return None
+
+            symbol = STRUCT_TYPE_LOOKUP[struct_type]
+            is_array = data_count is not None
+
+            if not is_array:
+                if symbol == "s":
+                    return None
+
+                if lookup is None and storage_type not in SCALAR_MEMBER_TYPES:
+                    return None
+
+                data_count = 1
+                member_format = NUMPY_TYPE_LOOKUP[symbol]
+
+            elif isinstance(data_count, str) or data_count <= 0:
+                # dynamic length
+                return None
+
+            elif symbol == "s":
+                if storage_type is not StorageType.STRING_MEMBER:
+                    return None
+
+                member_format = "S%d" % data_count
+
+            else:
+                if storage_type not in ARRAY_MEMBER_TYPES:
+                    return None
+
+                member_format = (NUMPY_TYPE_LOOKUP[symbol], (data_count,))
+
+            if export != SKIP:
+                names.append("f%d" % len(names))
+                formats.append(member_format)
+                offsets.append(struct_size)
+                fields.append((export, var_name, storage_type, symbol, is_array, lookup,
+                               struct_size))
+
+            struct_size += get_struct(data_count, symbol).size
+
+        if struct_size == 0:
+            return None
+
+        dtype = numpy.dtype({
+            "names": names,
+            "formats": formats,
+            "offsets": offsets,
+            "itemsize": struct_size,
+        })
+
+        return dtype, tuple(fields)
+
     @classmethod
     def get_data_format_members(
         cls,
@@ -0,0 +1,229 @@
+# Copyright 2026-2026 the openage authors. See copying.md for legal info.
+
+"""
+Tests for reading binary data with GenieStructure.
+"""
+
+import struct
+
+from openage.testing.testing import assert_value, assert_raises, result
+
+from .genie_structure import GenieStructure
+from .member_access import READ, READ_GEN, READ_UNKNOWN, SKIP
+from .read_members import EnumLookupMember, SubdataMember
+from .value_members import StorageType, member_tree
+
+
+# python struct format of one FixedStruct
+FIXED_STRUCT_FORMAT = struct.Struct("< h i f B 8s 3i 2B B i b b d 3s")
+
+
+class FixedStruct(GenieStructure):
+    """
+    Struct with a fixed size, which is read in bulk.
+    """
+
+    @classmethod
+    def get_data_format_members(cls, game_version):
+        return [
+            (READ_GEN, "int_value", StorageType.INT_MEMBER, "int16_t"),
+            (SKIP, "padding", StorageType.INT_MEMBER, "int32_t"),
+            (READ_GEN, "float_value", StorageType.FLOAT_MEMBER, "float"),
+            (READ_UNKNOWN, None, StorageType.INT_MEMBER, "uint8_t"),
+            (READ_GEN, "name", StorageType.STRING_MEMBER, "char[8]"),
+            (READ_GEN, "ids", StorageType.ARRAY_ID, "int32_t[3]"),
+            (READ_GEN, "flags", StorageType.ARRAY_BOOL, "uint8_t[2]"),
+            (READ_GEN, "bool_value", StorageType.BOOLEAN_MEMBER, "uint8_t"),
+            (READ_GEN, "id_value", StorageType.ID_MEMBER, "int32_t"),
+            (READ_GEN, "enum_name", StorageType.STRING_MEMBER, EnumLookupMember(
+                raw_type="int8_t",
+                type_name="test_enum",
+                lookup_dict={0: "ZERO", 1: "ONE"}
+            )),
+            (READ_GEN, "enum_id", StorageType.ID_MEMBER, EnumLookupMember(
+                raw_type="int8_t",
+                type_name="test_enum",
+                lookup_dict={0: "ZERO", 1: "ONE"}
+            )),
+            (READ, "read_value", StorageType.FLOAT_MEMBER, "double"),
+            (SKIP, "tail", StorageType.STRING_MEMBER, "char[3]"),
+        ]
+
+
+class MemberwiseStruct(FixedStruct):
+    """
+    Same as FixedStruct, but read member by member.
+    """
+
+    @classmethod
+    def get_fixed_layout(cls, game_version):
+        return None
+
+
+class FixedParent(GenieStructure):
+    """
+    Struct with a list of FixedStructs.
+    """
+
+    entry_cls = FixedStruct
+
+    @classmethod
+    def get_data_format_members(cls, game_version):
+        return [
+            (READ, "entry_count", StorageType.INT_MEMBER, "uint16_t"),
+            (READ_GEN, "entries", StorageType.ARRAY_CONTAINER, SubdataMember(
+                ref_type=cls.entry_cls,
+                length="entry_count",
+            )),
+        ]
+
+
+class MemberwiseParent(FixedParent):
+    """
+    Struct with a list of MemberwiseStructs.
+    """
+
+    entry_cls = MemberwiseStruct
+
+
+def pack_entries(entries):
+    """
+    Returns the binary data of a FixedParent with the given entries,
+    which are tuples of FIXED_STRUCT_FORMAT values.
+    """
+    data = struct.pack("<H", len(entries))
+    for entry in entries:
+        data += FIXED_STRUCT_FORMAT.pack(*entry)
+
+    return data
+
+
+def read_struct(struct_cls, data):
+    """
+    Reads data with struct_cls and returns the struct,
+    the end offset and the generated value members.
+    """
+    struct_obj = struct_cls()
+    offset, members = struct_obj.read(data, 0, None)
+
+    return struct_obj, offset, members
+
+
+class SkippingStruct(GenieStructure):
+    """
+    Struct with fixed-size and dynamic-size skipped members.
+    """
+
+    @classmethod
+    def get_data_format_members(cls, game_version):
+        return [
+            (READ, "first", StorageType.INT_MEMBER, "int16_t"),
+            (SKIP, "padding", StorageType.INT_MEMBER, "int32_t"),
+            (SKIP, "label", StorageType.STRING_MEMBER, "char[5]"),
+            (SKIP, "values", StorageType.ARRAY_INT, "int16_t[2]"),
+            (READ, "name_len", StorageType.INT_MEMBER, "uint16_t"),
+            (SKIP, "name", StorageType.STRING_MEMBER, "char[name_len]"),
+            (SKIP, "flag", StorageType.INT_MEMBER, "int8_t"),
+            (READ_GEN, "last", StorageType.INT_MEMBER, "int32_t"),
+        ]
+
+
+class UnmergedSkippingStruct(SkippingStruct):
+    """
+    Same as SkippingStruct, but reads every skipped member on its own.
+    """
+
+    @classmethod
+    def get_read_members(cls, game_version):
+        return tuple(cls.get_data_format(game_version,
+                                         allowed_modes=(True, READ, READ_GEN,
+                                                        READ_UNKNOWN, SKIP),
+                                         flatten_includes=False))
+
+
+def test_fixed_layout():
+    """
+    Bulk reads give the same attributes and value members
+    as reading member by member.
+    """
+    assert_value(FixedStruct.get_fixed_layout(None)[0].itemsize,
+                 FIXED_STRUCT_FORMAT.size)
+
+    data = pack_entries([
+        (-2, 99, 0.5, 7, b"first\0xy", 1, -1, 2, 1, 0, 1, 123, 0, 1, 2.5, b"abc"),
+        (300, 0, -1.25, 255, b"12345678", 0, 0, 0, 0, 1, 0, -5, 1, 0, -0.0, b"\0\0\0"),
+        (0, -1, 3e10, 0, b"", 7, 8, 9, 1, 1, 1, 0, 1, 1, 1e-300, b"xyz"),
+    ])
+
+    fixed_parent, fixed_offset, fixed_members = read_struct(FixedParent, data)
+    memberwise_parent, memberwise_offset, memberwise_members = read_struct(MemberwiseParent,
+                                                                           data)
+
+    assert_value(fixed_offset, len(data))
+    assert_value(memberwise_offset, len(data))
+
+    assert_value(len(fixed_parent.entries), 3)
+    assert_value([vars(entry) for entry in fixed_parent.entries],
+                 [vars(entry) for entry in memberwise_parent.entries])
+
+    assert_value([member_tree(member) for member in fixed_members],
+                 [member_tree(member) for member in memberwise_members])
+
+
+def test_fixed_layout_errors():
+    """
+    Bulk reads reject invalid floats and enum values like
+    reading member by member does.
+    """
+    entry = (0, 0, float("nan"), 0, b"", 0, 0, 0, 0, 0, 0, 0, 0, 0, 0.0, b"")
+    data = pack_entries([entry])
+
+    for parent_cls in (FixedParent, MemberwiseParent):
+        with assert_raises(SyntaxError):
+            result(read_struct(parent_cls, data))
+
+    entry = (0, 0, 0.0, 0, b"", 0, 0, 0, 0, 0, 0, 0, 5, 0, 0.0, b"")
+    data = pack_entries([entry])
+
+    for parent_cls in (FixedParent, MemberwiseParent):
+        with assert_raises(KeyError):
+            result(read_struct(parent_cls, data))
+
+
+def test_merged_skips():
+    """
+    Adjacent fixed-size skipped members are jumped over at once,
+    without changing what is read after them.
+    """
+    assert_value(SkippingStruct.get_read_members(None), (
+        (False, READ, "first", StorageType.INT_MEMBER, "int16_t"),
+        (False, SKIP, None, None, "char[13]"),
+        (False, READ, "name_len", StorageType.INT_MEMBER, "uint16_t"),
+        (False, SKIP, "name", StorageType.STRING_MEMBER, "char[name_len]"),
+        (False, SKIP, None, None, "char[1]"),
+        (False, READ_GEN, "last", StorageType.INT_MEMBER, "int32_t"),
+    ))
+
+    data = struct.pack("< h i 5s 2h H 4s b i", -3, 1, b"label", 2, 3, 4, b"name", 1, 77)
+
+    merged, merged_offset, merged_members = read_struct(SkippingStruct, data)
+    unmerged, unmerged_offset, unmerged_members = read_struct(UnmergedSkippingStruct,
+                                                              data)
+
+    assert_value(merged_offset, len(data))
+    assert_value(unmerged_offset, len(data))
+
+    assert_value(vars(merged), {"first": -3, "name_len": 4, "last": 77})
+    assert_value(vars(merged), vars(unmerged))
+
+    assert_value([member_tree(member) for member in merged_members],
+                 [member_tree(member) for member in unmerged_members])
+
+
+def test():
+    """
+    Tests for reading binary data.
+    """
+    test_fixed_layout()
+    test_fixed_layout_errors()
+    test_merged_skips()
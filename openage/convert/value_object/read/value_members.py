@@ -1,4 +1,4 @@
-# Copyright 2019-2023 the openage authors. See copying.md for legal info.
+# Copyright 2019-2026 the openage authors. See copying.md for legal info.
 # TODO pylint: disable=C,R,abstract-method
 
 """
@@ -671,6 +671,23 @@ class RightMissingMember(ValueMember):
             f"{type(self)} cannot be diffed")
 
 
+def member_tree(member: ValueMember) -> tuple:
+    """
+    Returns the type, name and value of member and all of its submembers
+    as nested tuples, which can be compared with ==.
+    """
+    if isinstance(member, ContainerMember):
+        return (ContainerMember, member.name,
+                tuple((key, member_tree(submember))
+                      for key, submember in member.value.items()))
+
+    if isinstance(member, ArrayMember):
+        return (ArrayMember, member.name, member.get_type(),
+                tuple(member_tree(submember) for submember in member.value))
+
+    return (type(member), member.name, member.value)
+
+
 class StorageType(Enum):
     """
     Types for values members.
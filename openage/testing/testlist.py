@@ -1,4 +1,4 @@
-# Copyright 2015-2024 the openage authors. See copying.md for legal info.
+# Copyright 2015-2026 the openage authors. See copying.md for legal info.
 
 """ Lists of all possible tests; enter your tests here. """
 
@@ -26,6 +26,10 @@ def tests_py():
     yield "openage.assets.test"
     yield ("openage.cabextract.test.test", "test CAB archive extraction",
            lambda env: env["has_assets"])
+    yield ("openage.convert.service.read.test.test",
+           "test reading the dat file and the gamespec cache")
+    yield ("openage.convert.value_object.read.test.test",
+           "test reading structs in bulk and member by member")
     yield "openage.cppinterface.exctranslate_tests.cpp_to_py"
     yield ("openage.cppinterface.exctranslate_tests.cpp_to_py_bounce",
            "translates the exception back and forth a few times")